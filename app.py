@@ -1,23 +1,84 @@
-from flask import Flask, jsonify, request
-from flasgger import Swagger
+import os
+import threading
+from flask import Flask
 from routes.habitos import habitos_bp
 from routes.categorias_habitos import categorias_bp
 from routes.seguimiento_habitos import seguimiento_bp
 from routes.estadisticas_habitos import estadisticas_bp
-# 1. IMPORTA EL BLUEPRINT DE ECONOMÍA
-from routes.economia import economia_bp 
-import os
+from routes.economia import economia_bp
+from routes.sistema import sistema_bp
+from routes.usuarios import usuarios_bp
+from services import admision, metricas, perfilado
+from services.serializacion import ProveedorJSON
+
+BLUEPRINTS = (
+    habitos_bp,
+    categorias_bp,
+    seguimiento_bp,
+    estadisticas_bp,
+    economia_bp,
+    sistema_bp,
+    usuarios_bp
+)
+
+# Rutas de flasgger (/apidocs/, /apispec_1.json y sus estáticos)
+PREFIJOS_DOCS = ("/apidocs", "/apispec", "/flasgger_static")
+
+
+class DocsDiferidos:
+    """
+    Atiende las rutas de documentación con una segunda app que tiene
+    flasgger y se crea en el primer acceso; el resto va a la app normal.
+    Así ni el arranque ni cada worker importan flasgger ni leen los
+    docstrings de las rutas hasta que alguien abre /apidocs.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+        self._docs = None
+        self._lock = threading.Lock()
+
+    def _app_docs(self):
+        if self._docs is None:
+            with self._lock:
+                if self._docs is None:
+                    self._docs = crear_app(con_docs=True)
+        return self._docs
+
+    def __call__(self, environ, start_response):
+        if environ.get("PATH_INFO", "").startswith(PREFIJOS_DOCS):
+            return self._app_docs()(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+
+# =========================
+# FÁBRICA DE LA APP
+# =========================
+def crear_app(con_docs=False):
+    """
+    No crea clientes de base de datos: firebase.db se crea en la primera
+    petición de cada proceso, así que la app se puede cargar antes del
+    fork (gunicorn --preload).
+    """
+    app = Flask(__name__)
+    app.json = ProveedorJSON(app)
+
+    for blueprint in BLUEPRINTS:
+        app.register_blueprint(blueprint)
+
+    if con_docs:
+        from flasgger import Swagger
+        Swagger(app)
+    else:
+        admision.instalar(app)
+        metricas.instalar(app)
+        perfilado.instalar(app)
+        app.wsgi_app = DocsDiferidos(app.wsgi_app)
 
-app = Flask(__name__)
-swagger = Swagger(app)
+    return app
 
-# 2. REGISTRA TODOS LOS BLUEPRINTS
-app.register_blueprint(habitos_bp)
-app.register_blueprint(categorias_bp)
-app.register_blueprint(seguimiento_bp)
-app.register_blueprint(estadisticas_bp)
-app.register_blueprint(economia_bp) # <-- ASEGÚRATE DE QUE ESTA LÍNEA ESTÉ AQUÍ
 
+app = crear_app()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+"""
+Modo de servicio asíncrono (opcional).
+
+Las lecturas más frecuentes se atienden con handlers async sobre Quart y
+firestore.AsyncClient (routes/asincronas.py); el resto de rutas, incluida
+/apidocs, pasan a la app Flask de app.py, que corre en un pool de hilos.
+Las URLs y las respuestas son las mismas que en el modo síncrono. Los
+listados paginados o en flujo (?limite=, ?cursor=, ?flujo=) también los
+atiende Flask, igual que las que traen la cabecera X-Perfil.
+
+    pip install -r requirements-async.txt
+    hypercorn asgi:app --bind 0.0.0.0:$PORT
+"""
+import os
+from urllib.parse import parse_qs
+from a2wsgi import WSGIMiddleware
+from quart import Quart
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+from app import app as app_wsgi
+from routes.asincronas import asincronas_bp
+from services.paginacion import PARAMETROS as PARAMETROS_PAGINACION
+from services import admision, metricas, perfilado
+from services.serializacion import ProveedorJSON
+
+# Las cabeceras ASGI llegan en minúsculas y como bytes
+CABECERA_PERFIL = perfilado.CABECERA.lower().encode("latin-1")
+
+app_async = Quart(__name__, static_folder=None)
+app_async.json = ProveedorJSON(app_async)
+app_async.register_blueprint(asincronas_bp)
+admision.instalar_async(app_async)
+metricas.instalar_async(app_async)
+
+
+class AppHibrida:
+    def __init__(self, app_async, app_wsgi, hilos_wsgi=10):
+        self.app_async = app_async
+        self.app_wsgi = WSGIMiddleware(app_wsgi, workers=hilos_wsgi)
+        self._rutas = app_async.url_map.bind("")
+
+    def _es_asincrona(self, scope):
+        parametros = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        if any(p in parametros for p in PARAMETROS_PAGINACION):
+            return False
+        # Las peticiones a perfilar las atiende Flask, que es donde está el perfilador
+        if any(nombre == CABECERA_PERFIL for nombre, _ in scope.get("headers", ())):
+            return False
+        try:
+            self._rutas.match(scope["path"], method=scope["method"])
+            return True
+        except (HTTPException, RequestRedirect):
+            return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and not self._es_asincrona(scope):
+            await self.app_wsgi(scope, receive, send)
+        else:
+            await self.app_async(scope, receive, send)
+
+
+app = AppHibrida(app_async, app_wsgi, int(os.environ.get("HILOS_WSGI", 10)))
@@ -0,0 +1,119 @@
+"""
+Tiempo de arranque de la API.
+
+Mide, cada vez en un proceso nuevo con el backend SQLite:
+  - importación: import app (lo que paga el master de gunicorn o cada
+    worker sin --preload)
+  - primera petición: la que crea el cliente de base de datos
+  - worker: fork de un proceso que ya importó la app (gunicorn --preload)
+    hasta que atiende su primera petición
+y lista los módulos más lentos de importar según python -X importtime.
+Con --presupuesto-ms termina con código 1 si la importación lo supera,
+para usarlo como control en CI.
+
+Uso:
+    python -m bench.arranque
+    python -m bench.arranque --repeticiones 5 --presupuesto-ms 800
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Se ejecuta en un proceso nuevo; imprime los tiempos en JSON
+_MEDICION = """
+import json, os, time
+inicio = time.perf_counter()
+import app
+importacion = time.perf_counter() - inicio
+
+def primera_peticion():
+    inicio = time.perf_counter()
+    respuesta = app.app.test_client().get("/monedas/arranque")
+    assert respuesta.status_code == 200, respuesta.status_code
+    return time.perf_counter() - inicio
+
+lectura, escritura = os.pipe()
+inicio_fork = time.perf_counter()
+pid = os.fork()
+if pid == 0:
+    primera_peticion()
+    os.write(escritura, str(time.perf_counter() - inicio_fork).encode())
+    os._exit(0)
+os.waitpid(pid, 0)
+worker = float(os.read(lectura, 64))
+
+print(json.dumps({
+    "importacion": importacion,
+    "primera_peticion": primera_peticion(),
+    "worker": worker
+}))
+"""
+
+
+def _entorno(sqlite_path):
+    entorno = dict(os.environ, STORAGE_BACKEND="sqlite", SQLITE_PATH=sqlite_path)
+    entorno["PYTHONPATH"] = os.pathsep.join(filter(None, [RAIZ, entorno.get("PYTHONPATH")]))
+    return entorno
+
+
+def medir(sqlite_path):
+    salida = subprocess.run(
+        [sys.executable, "-c", _MEDICION],
+        cwd=RAIZ, env=_entorno(sqlite_path), capture_output=True, text=True, check=True
+    )
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def modulos_lentos(sqlite_path, cantidad, profundidad=2):
+    """
+    Módulos importados por app (hasta esa profundidad) con más tiempo
+    acumulado de importación.
+    """
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=RAIZ, env=_entorno(sqlite_path), capture_output=True, text=True, check=True
+    )
+
+    tiempos = []
+    for linea in salida.stderr.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, modulo = linea[len("import time:"):].split("|")
+        # Cada nivel de anidación agrega dos espacios después del separador
+        nivel = (len(modulo) - len(modulo.lstrip()) - 1) // 2
+        if 1 <= nivel <= profundidad:
+            tiempos.append((int(acumulado) / 1000, modulo.strip()))
+    return sorted(tiempos, reverse=True)[:cantidad]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de la API")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--modulos", type=int, default=10, help="módulos más lentos a listar")
+    parser.add_argument("--presupuesto-ms", type=float, help="máximo para la mediana de la importación")
+    parser.add_argument("--sqlite-path", default=":memory:")
+    args = parser.parse_args(argv)
+
+    mediciones = [medir(args.sqlite_path) for _ in range(args.repeticiones)]
+
+    medianas = {}
+    for clave in ("importacion", "primera_peticion", "worker"):
+        valores = sorted(m[clave] * 1000 for m in mediciones)
+        medianas[clave] = valores[len(valores) // 2]
+        print(f"{clave:<20} {medianas[clave]:>8.1f} ms   (min {valores[0]:.1f}, max {valores[-1]:.1f})")
+
+    print("\nMódulos más lentos de importar (acumulado):")
+    for ms, modulo in modulos_lentos(args.sqlite_path, args.modulos):
+        print(f"  {ms:>8.1f} ms  {modulo}")
+
+    if args.presupuesto_ms is not None and medianas["importacion"] > args.presupuesto_ms:
+        print(f"\nLa importación ({medianas['importacion']:.1f} ms) supera el presupuesto de {args.presupuesto_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""
+Benchmark de los endpoints de la API.
+
+Siembra una población sintética (usuarios x hábitos x días de seguimiento)
+en el backend SQLite en memoria, que implementa la misma superficie del
+cliente de Firestore que usan los blueprints, y recorre cada ruta con el
+cliente de pruebas de Flask. Por endpoint reporta throughput, latencias
+p50/p95/p99 y consultas, lecturas y escrituras al datastore por petición.
+
+Uso:
+    python -m bench.benchmark --usuarios 10 --habitos 40 --dias 90
+    python -m bench.benchmark --salida actual.json --comparar base.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIAS_GLOBALES = ["Salud", "Estudio", "Finanzas", "Hogar", "Social"]
+
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = max(int(round(p / 100 * len(ordenados))) - 1, 0)
+    return ordenados[min(indice, len(ordenados) - 1)]
+
+
+# =========================
+# POBLACIÓN SINTÉTICA
+# =========================
+def sembrar(db, usuarios, habitos, dias, rng):
+    """Carga la población directamente en el datastore, sin pasar por la API."""
+    from services import rachas
+    from services.contadores_categorias import reconstruir_contadores
+    from services.nombres_habitos import reconstruir_nombres
+    from services.seguimiento import seguimiento_ref
+
+    hoy = date.today()
+    poblacion = {"usuarios": [], "habitos": {}, "categorias": {}}
+    batch = db.batch()
+
+    def _agregar(ref, datos):
+        nonlocal batch
+        batch.set(ref, datos)
+        if len(batch) >= 500:
+            batch.commit()
+            batch = db.batch()
+
+    for nombre in CATEGORIAS_GLOBALES:
+        id_categoria = f"ch_{nombre.lower()}"
+        _agregar(db.collection("categorias_habitos").document(id_categoria), {
+            "id_categoria": id_categoria,
+            "nombre": nombre,
+            "nombre_orden": nombre.lower(),
+            "color": "#9E9E9E",
+            "icono": "category",
+            "id_usuario": None,
+            "estado": "activa",
+            "fecha_creacion": "2025-01-01T00:00:00"
+        })
+
+    for u in range(usuarios):
+        id_usuario = f"bench_u{u}"
+        poblacion["usuarios"].append(id_usuario)
+        poblacion["habitos"][id_usuario] = []
+        _agregar(db.collection("usuarios").document(id_usuario), {
+            "nombre": f"Usuario {u}",
+            "monedas": rng.randint(0, 500)
+        })
+
+        id_propia = f"ch_bench_u{u}"
+        poblacion["categorias"][id_usuario] = id_propia
+        _agregar(db.collection("categorias_habitos").document(id_propia), {
+            "id_categoria": id_propia,
+            "nombre": f"Propia {u}",
+            "nombre_orden": f"propia {u}",
+            "color": "#4CAF50",
+            "icono": "star",
+            "id_usuario": id_usuario,
+            "estado": "activa",
+            "fecha_creacion": "2025-01-01T00:00:00"
+        })
+
+        for h in range(habitos):
+            id_habito = f"h_bench_{u}_{h}"
+            poblacion["habitos"][id_usuario].append(id_habito)
+            _agregar(db.collection("habitos").document(id_habito), {
+                "id_habito": id_habito,
+                "id_usuario": id_usuario,
+                "nombre_habito": f"Habito {h}",
+                "id_categoria": rng.choice(CATEGORIAS_GLOBALES),
+                "descripcion": "",
+                "frecuencia": "diaria",
+                "target_per_day": 1,
+                "estado_habito": "activo" if rng.random() < 0.9 else "inactivo",
+                "color": "#2EB38E",
+                "reminder_time": None,
+                "fecha_creacion": "2025-01-01T00:00:00"
+            })
+
+            completados = []
+            for d in range(dias, -1, -1):
+                if rng.random() < 0.3:
+                    continue
+                fecha = (hoy - timedelta(days=d)).isoformat()
+                progreso = 1.0 if rng.random() < 0.7 else round(rng.random(), 2)
+                if progreso >= 1:
+                    completados.append(fecha)
+                _agregar(seguimiento_ref(id_habito, fecha), {
+                    "id_usuario": id_usuario,
+                    "id_habito": id_habito,
+                    "fecha": fecha,
+                    "progreso": progreso,
+                    "estado": "completado" if progreso >= 1 else "parcial",
+                    "nota": "",
+                    "ultima_actualizacion": f"{fecha}T12:00:00"
+                })
+
+            for ref, datos in rachas.escrituras_estado(id_habito, rachas.estado_desde_fechas(completados)):
+                _agregar(ref, datos)
+
+    batch.commit()
+    reconstruir_contadores()
+    reconstruir_nombres()
+    return poblacion
+
+
+# =========================
+# ESCENARIOS
+# =========================
+def _escenarios(app, db, poblacion, rng):
+    """
+    Cada escenario devuelve (método, url, json) listo para el cliente de
+    Flask, con las cabeceras como cuarto elemento opcional.
+    """
+    hoy = date.today()
+    cliente = app.test_client()
+
+    def usuario():
+        return rng.choice(poblacion["usuarios"])
+
+    def habito():
+        return rng.choice(poblacion["habitos"][usuario()])
+
+    def fecha():
+        return (hoy - timedelta(days=rng.randint(0, 30))).isoformat()
+
+    def habito_desechable():
+        id_habito = f"h_bench_tmp_{rng.getrandbits(40):x}"
+        db.collection("habitos").document(id_habito).set({
+            "id_habito": id_habito,
+            "id_usuario": usuario(),
+            "nombre_habito": id_habito,
+            "id_categoria": "Salud",
+            "estado_habito": "activo"
+        })
+        return id_habito
+
+    def categoria_desechable():
+        id_categoria = f"ch_bench_tmp_{rng.getrandbits(40):x}"
+        db.collection("categorias_habitos").document(id_categoria).set({
+            "id_categoria": id_categoria,
+            "nombre": id_categoria,
+            "nombre_orden": id_categoria,
+            "id_usuario": usuario(),
+            "estado": "activa"
+        })
+        return id_categoria
+
+    def condicional(url):
+        """GET con el ETag vigente, como un cliente que repite el sondeo."""
+        etag = cliente.get(url).headers.get("ETag")
+        return "GET", url, None, {"If-None-Match": etag}
+
+    return {
+        "GET /habitos/<id_usuario>": lambda: ("GET", f"/habitos/{usuario()}", None),
+        "POST /habitos": lambda: ("POST", "/habitos", {
+            "id_usuario": usuario(),
+            "nombre_habito": f"Nuevo {rng.getrandbits(40):x}",
+            "id_categoria": rng.choice(CATEGORIAS_GLOBALES),
+            "frecuencia": "diaria"
+        }),
+        "PATCH /habitos/<id_habito>": lambda: ("PATCH", f"/habitos/{habito()}", {
+            "id_categoria": rng.choice(CATEGORIAS_GLOBALES)
+        }),
+        "DELETE /habitos/<id_habito>": lambda: ("DELETE", f"/habitos/{habito_desechable()}", None),
+        "GET /categorias-habitos/<id_usuario>": lambda: ("GET", f"/categorias-habitos/{usuario()}", None),
+        "POST /categorias-habitos": lambda: ("POST", "/categorias-habitos", {
+            "nombre": f"Cat {rng.getrandbits(40):x}",
+            "id_usuario": usuario()
+        }),
+        "PATCH /categorias-habitos/<id_categoria>": lambda: (
+            "PATCH", f"/categorias-habitos/{poblacion['categorias'][usuario()]}", {"color": "#000000"}
+        ),
+        "DELETE /categorias-habitos/<id_categoria>": lambda: (
+            "DELETE", f"/categorias-habitos/{categoria_desechable()}", None
+        ),
+        "POST /seguimiento": lambda: ("POST", "/seguimiento", {
+            "id_habito": habito(),
+            "fecha": fecha(),
+            "progreso": rng.choice([0.5, 1.0])
+        }),
+        "POST /seguimiento/batch": lambda: ("POST", "/seguimiento/batch", {
+            "seguimientos": [
+                {"id_habito": habito(), "fecha": fecha(), "progreso": rng.choice([0.5, 1.0])}
+                for _ in range(20)
+            ]
+        }),
+        "POST /habitos/registrar_avance": lambda: ("POST", "/habitos/registrar_avance", {
+            "habit_id": habito(),
+            "porcentaje": rng.choice([50, 100]),
+            "fecha": fecha()
+        }),
+        "GET /habitos/estadisticas/<id_habito>": lambda: ("GET", f"/habitos/estadisticas/{habito()}", None),
+        "POST /recompensar": lambda: ("POST", "/recompensar", {
+            "id_usuario": usuario(),
+            "puntos": rng.randint(1, 10)
+        }),
+        "GET /monedas/<id_usuario>": lambda: ("GET", f"/monedas/{usuario()}", None),
+        "GET /usuarios/<id_usuario>/dashboard": lambda: ("GET", f"/usuarios/{usuario()}/dashboard", None),
+        "GET /habitos/<id_habito>/analitica": lambda: (
+            "GET", f"/habitos/{habito()}/analitica?desde={hoy - timedelta(days=90)}&granularidad=semana", None
+        ),
+        "GET /usuarios/<id_usuario>/analitica": lambda: (
+            "GET", f"/usuarios/{usuario()}/analitica?desde={hoy - timedelta(days=90)}&granularidad=mes", None
+        ),
+        "GET /habitos/<id_usuario> (If-None-Match)": lambda: condicional(f"/habitos/{usuario()}"),
+        "GET /habitos/estadisticas/<id_habito> (If-None-Match)": lambda: condicional(
+            f"/habitos/estadisticas/{habito()}"
+        ),
+        "GET /monedas/<id_usuario> (If-None-Match)": lambda: condicional(f"/monedas/{usuario()}"),
+    }
+
+
+# =========================
+# EJECUCIÓN
+# =========================
+def ejecutar(app, db, escenarios, iteraciones, calentamiento, filtro=None):
+    cliente = app.test_client()
+    resultados = {}
+
+    for nombre, generar in escenarios.items():
+        if filtro and filtro not in nombre:
+            continue
+
+        for _ in range(calentamiento):
+            metodo, url, cuerpo, *cabeceras = generar()
+            cliente.open(url, method=metodo, json=cuerpo, headers=cabeceras[0] if cabeceras else None)
+
+        latencias = []
+        errores = 0
+        consultas = lecturas = escrituras = 0
+
+        for _ in range(iteraciones):
+            metodo, url, cuerpo, *cabeceras = generar()
+            antes = dict(db.metricas)
+
+            inicio = time.perf_counter()
+            respuesta = cliente.open(url, method=metodo, json=cuerpo, headers=cabeceras[0] if cabeceras else None)
+            latencias.append(time.perf_counter() - inicio)
+
+            if respuesta.status_code >= 500:
+                errores += 1
+            consultas += db.metricas["consultas"] - antes["consultas"]
+            lecturas += db.metricas["lecturas"] - antes["lecturas"]
+            escrituras += db.metricas["escrituras"] - antes["escrituras"]
+
+        total = sum(latencias)
+        resultados[nombre] = {
+            "peticiones": iteraciones,
+            "errores": errores,
+            "throughput_rps": iteraciones / total if total else 0.0,
+            "p50_ms": _percentil(latencias, 50) * 1000,
+            "p95_ms": _percentil(latencias, 95) * 1000,
+            "p99_ms": _percentil(latencias, 99) * 1000,
+            "consultas_por_peticion": consultas / iteraciones,
+            "lecturas_por_peticion": lecturas / iteraciones,
+            "escrituras_por_peticion": escrituras / iteraciones,
+        }
+
+    return resultados
+
+
+def imprimir(resultados, base=None):
+    columnas = ("endpoint", "rps", "p50 ms", "p95 ms", "p99 ms", "consultas", "lecturas", "escrituras", "err")
+    print(f"{columnas[0]:<42} " + " ".join(f"{c:>10}" for c in columnas[1:]))
+
+    for nombre, r in resultados.items():
+        fila = [
+            f"{r['throughput_rps']:.1f}",
+            f"{r['p50_ms']:.2f}",
+            f"{r['p95_ms']:.2f}",
+            f"{r['p99_ms']:.2f}",
+            f"{r['consultas_por_peticion']:.1f}",
+            f"{r['lecturas_por_peticion']:.1f}",
+            f"{r['escrituras_por_peticion']:.1f}",
+            str(r["errores"]),
+        ]
+        print(f"{nombre:<42} " + " ".join(f"{v:>10}" for v in fila))
+
+        if base and nombre in base:
+            b = base[nombre]
+            cambios = []
+            for clave in ("p95_ms", "lecturas_por_peticion"):
+                if b[clave]:
+                    cambios.append(f"{clave} {(r[clave] - b[clave]) / b[clave] * 100:+.1f}%")
+            if cambios:
+                print(f"{'':<42}   vs base: " + ", ".join(cambios))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los endpoints de la API")
+    parser.add_argument("--usuarios", type=int, default=10)
+    parser.add_argument("--habitos", type=int, default=20, help="hábitos por usuario")
+    parser.add_argument("--dias", type=int, default=60, help="días de seguimiento por hábito")
+    parser.add_argument("--iteraciones", type=int, default=200, help="peticiones medidas por endpoint")
+    parser.add_argument("--calentamiento", type=int, default=10)
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--endpoint", help="solo endpoints que contengan este texto")
+    parser.add_argument("--sin-cache", action="store_true", help="desactivar la caché de listados")
+    parser.add_argument("--sqlite-path", default=":memory:", help="usar un archivo en lugar de memoria")
+    parser.add_argument("--salida", help="guardar los resultados en JSON")
+    parser.add_argument("--comparar", help="JSON de una ejecución anterior para comparar")
+    args = parser.parse_args(argv)
+
+    os.environ["STORAGE_BACKEND"] = "sqlite"
+    os.environ["SQLITE_PATH"] = args.sqlite_path
+    if args.sin_cache:
+        os.environ["CACHE_TTL_SEGUNDOS"] = "0"
+
+    from app import app
+    from firebase import db
+
+    rng = random.Random(args.semilla)
+
+    inicio = time.perf_counter()
+    poblacion = sembrar(db, args.usuarios, args.habitos, args.dias, rng)
+    print(f"Población sembrada en {time.perf_counter() - inicio:.1f}s: "
+          f"{args.usuarios} usuarios x {args.habitos} hábitos x {args.dias} días")
+
+    escenarios = _escenarios(app, db, poblacion, rng)
+    resultados = ejecutar(app, db, escenarios, args.iteraciones, args.calentamiento, args.endpoint)
+
+    base = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            base = json.load(f)["resultados"]
+
+    imprimir(resultados, base)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"parametros": vars(args), "resultados": resultados}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
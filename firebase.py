@@ -1,14 +1,134 @@
 import os
 import json
-import firebase_admin
-from firebase_admin import credentials, firestore
+import threading
+from functools import wraps
 
-firebase_key = os.environ.get("FIREBASE_KEYS")
+# "firestore" (por defecto) o "sqlite"
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "firestore")
 
-if not firebase_key:
-    raise ValueError("FIREBASE_KEYS no está definida")
+if STORAGE_BACKEND not in ("firestore", "sqlite"):
+    raise ValueError(f"STORAGE_BACKEND no soportado: {STORAGE_BACKEND}")
 
-cred = credentials.Certificate(json.loads(firebase_key))
-firebase_admin.initialize_app(cred)
 
-db = firestore.client()
+# =========================
+# CREACIÓN DE CLIENTES
+# =========================
+def _credenciales():
+    from firebase_admin import credentials
+
+    firebase_key = os.environ.get("FIREBASE_KEYS")
+    if not firebase_key:
+        raise ValueError("FIREBASE_KEYS no está definida")
+
+    cert = credentials.Certificate(json.loads(firebase_key))
+    return cert.project_id, cert.get_credential()
+
+
+def crear_cliente():
+    if STORAGE_BACKEND == "sqlite":
+        from storage.sqlite_client import SQLiteClient
+
+        return SQLiteClient(os.environ.get("SQLITE_PATH", "habitos.db"))
+
+    from google.cloud import firestore
+
+    proyecto, credencial = _credenciales()
+    return firestore.Client(project=proyecto, credentials=credencial)
+
+
+def crear_cliente_async(cliente):
+    """Cliente para el modo asíncrono (asgi.py); cliente es el síncrono del mismo proceso."""
+    if STORAGE_BACKEND == "sqlite":
+        from storage.async_adapter import AsyncClient
+
+        return AsyncClient(cliente)
+
+    from google.cloud import firestore
+
+    proyecto, credencial = _credenciales()
+    return firestore.AsyncClient(project=proyecto, credentials=credencial)
+
+
+class ClienteDiferido:
+    """
+    Crea el cliente en el primer uso y lo descarta en el proceso hijo
+    después de un fork: los canales gRPC (y las conexiones SQLite) no
+    sobreviven al fork, así que con gunicorn --preload cada worker crea el
+    suyo en su primera petición. Los módulos siguen haciendo
+    from firebase import db y usan el objeto como si fuera el cliente.
+    """
+
+    def __init__(self, crear):
+        self._crear = crear
+        self._cliente = None
+        self._lock = threading.Lock()
+        os.register_at_fork(after_in_child=self._descartar)
+
+    def _descartar(self):
+        self._cliente = None
+        self._lock = threading.Lock()
+
+    def obtener(self):
+        cliente = self._cliente
+        if cliente is None:
+            with self._lock:
+                if self._cliente is None:
+                    self._cliente = self._crear()
+                cliente = self._cliente
+        return cliente
+
+    def creado(self):
+        return self._cliente is not None
+
+    def __getattr__(self, nombre):
+        return getattr(self.obtener(), nombre)
+
+
+# METRICAS_DATASTORE=0 desactiva el conteo por petición (ver services/metricas.py)
+INSTRUMENTAR = os.environ.get("METRICAS_DATASTORE", "1").lower() not in ("0", "false", "no")
+
+
+def instrumentar(cliente):
+    if not INSTRUMENTAR:
+        return cliente
+    from storage.instrumentado import ClienteInstrumentado
+
+    return ClienteInstrumentado(cliente)
+
+
+# cliente_base es el cliente sin instrumentar; el adaptador asíncrono de
+# SQLite se monta sobre él
+cliente_base = ClienteDiferido(crear_cliente)
+db = ClienteDiferido(lambda: instrumentar(cliente_base.obtener()))
+
+
+def transaccional(funcion):
+    """
+    Igual que firestore.transactional (o el equivalente de SQLite), pero
+    sin importar el cliente al decorar: las rutas se decoran al importarse.
+    Con el cliente instrumentado, las escrituras de la transacción se
+    anotan una sola vez, cuando el intento que confirma termina.
+    """
+    def intento(transaction, *args, **kwargs):
+        escritor = transaction
+        if INSTRUMENTAR:
+            from storage.instrumentado import Escritor
+
+            if not isinstance(transaction, Escritor):
+                escritor = Escritor(transaction, "transacción")
+            escritor.descartar_pendientes()
+        return funcion(escritor, *args, **kwargs), escritor
+
+    @wraps(funcion)
+    def envoltura(transaction, *args, **kwargs):
+        if STORAGE_BACKEND == "sqlite":
+            from storage.sqlite_client import transactional
+        else:
+            from google.cloud.firestore import transactional
+
+        resultado, escritor = transactional(intento)(transaction, *args, **kwargs)
+        if INSTRUMENTAR:
+            escritor.confirmar_pendientes()
+        return resultado
+
+    return envoltura
@@ -0,0 +1,5 @@
+from firebase import ClienteDiferido, cliente_base, crear_cliente_async, instrumentar
+
+# Cliente para el modo asíncrono (asgi.py). Como db, se crea en el primer
+# uso dentro de cada proceso.
+db_async = ClienteDiferido(lambda: instrumentar(crear_cliente_async(cliente_base.obtener())))